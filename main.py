@@ -8,13 +8,17 @@ import asyncio
 import json
 import logging
 import os
+import time
+from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, List, Dict, Any
+import aiohttp
 from dotenv import load_dotenv
-from reolink_aio.api import Host
-from reolink_aio.exceptions import LoginPrivacyModeError
-from video_recorder import VideoRecorder
+from reolink_aio.api import Host, SSL_CONTEXT
+from reolink_aio.exceptions import LoginPrivacyModeError, ReolinkError
+from snapshot_broker import SnapshotBroker
+from video_recorder import VideoRecorder, mask_credentials
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -24,6 +28,149 @@ logging.basicConfig(
 _LOGGER = logging.getLogger(__name__)
 
 
+def _part_path(path: Path) -> Path:
+    """Liefert den temporären Pfad (.part) für atomares Schreiben."""
+    return path.with_suffix(path.suffix + '.part')
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Schreibt Daten atomar in eine Datei (blockierend, für asyncio.to_thread).
+    Die Datei erscheint erst nach dem Umbenennen unter ihrem finalen Namen.
+    """
+    tmp_path = _part_path(path)
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Unvollständige Datei nicht liegen lassen (z.B. Platte voll)
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class RecordingState(Enum):
+    """Aufnahme-Zustand einer Kamera."""
+
+    IDLE = "idle"  # Keine Aufnahme
+    RECORDING = "recording"  # Person sichtbar, Aufnahme läuft
+    TAIL = "tail"  # Person weg, Aufnahme läuft im Nachlauf weiter
+
+
+@dataclass
+class CameraConfig:
+    """Konfiguration einer einzelnen Kamera aus cameras.json."""
+
+    name: str
+    host: str
+    username: str
+    password: str = field(repr=False)
+    port: int = 80
+    detection_channel: int = 0
+    recording_channels: List[int] = field(default_factory=lambda: [0])
+    enabled: bool = True
+    stream_format: str = "h264"
+    snapshot_broker: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CameraConfig":
+        """
+        Erstellt die Kamera-Konfiguration aus einem JSON-Eintrag.
+
+        Args:
+            data: Kamera-Eintrag aus der Konfigurationsdatei
+
+        Returns:
+            Validierte Kamera-Konfiguration
+
+        Raises:
+            ValueError: Wenn Pflichtfelder fehlen oder Werte ungültig sind
+        """
+        missing = [key for key in ('name', 'host', 'username', 'password')
+                   if not data.get(key)]
+        if missing:
+            raise ValueError(f"Pflichtfelder fehlen: {', '.join(missing)}")
+
+        # Fallback: wenn alte 'channel' Konfiguration verwendet wird
+        channel = int(data.get('channel', 0))
+        detection_channel = data.get('detection_channel')
+        recording_channels = data.get('recording_channels')
+
+        return cls(
+            name=str(data['name']),
+            host=str(data['host']),
+            username=str(data['username']),
+            password=str(data['password']),
+            port=int(data.get('port', 80)),
+            detection_channel=channel if detection_channel is None else int(
+                detection_channel),
+            recording_channels=[channel] if recording_channels is None else [
+                int(ch) for ch in recording_channels],
+            enabled=bool(data.get('enabled', True)),
+            stream_format=str(data.get('stream_format', 'h264')),
+            snapshot_broker=bool(data.get('snapshot_broker', False))
+        )
+
+
+@dataclass
+class Settings:
+    """Globale Einstellungen aus cameras.json."""
+
+    post_detection_duration: int = 15
+    recordings_base_dir: str = "./recordings"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Settings":
+        """
+        Erstellt die Einstellungen aus dem 'settings'-Block.
+
+        Args:
+            data: 'settings'-Block aus der Konfigurationsdatei
+
+        Returns:
+            Einstellungen mit Standardwerten für fehlende Felder
+        """
+        return cls(
+            post_detection_duration=int(
+                data.get('post_detection_duration', 15)),
+            recordings_base_dir=str(
+                data.get('recordings_base_dir', './recordings'))
+        )
+
+
+@dataclass
+class Config:
+    """Gesamte Konfiguration aus cameras.json."""
+
+    cameras: List[CameraConfig]
+    settings: Settings
+
+
+def _build_watcher_kwargs(camera: CameraConfig, settings: Settings) -> Dict[str, Any]:
+    """
+    Erstellt die Konstruktor-Argumente für einen ReolinkWatcher.
+
+    Args:
+        camera: Kamera-Konfiguration
+        settings: Globale Einstellungen
+
+    Returns:
+        Keyword-Argumente für ReolinkWatcher
+    """
+    return {
+        'camera_name': camera.name,
+        'host': camera.host,
+        'username': camera.username,
+        'password': camera.password,
+        'port': camera.port,
+        'detection_channel': camera.detection_channel,
+        'recording_channels': camera.recording_channels,
+        'recordings_base_dir': settings.recordings_base_dir,
+        'post_detection_duration': settings.post_detection_duration,
+        'stream_format': camera.stream_format,
+        'snapshot_broker': camera.snapshot_broker,
+    }
+
+
 class ReolinkWatcher:
     """Überwacht Reolink-Kamera auf Personenerkennung."""
 
@@ -38,7 +185,9 @@ class ReolinkWatcher:
         recording_channels: List[int] = None,
         recordings_base_dir: str = "./recordings",
         post_detection_duration: int = 15,
-        stream_format: str = "h264"
+        stream_format: str = "h264",
+        aiohttp_session: Optional[aiohttp.ClientSession] = None,
+        snapshot_broker: bool = False
     ):
         """
         Initialisiert den Reolink Watcher.
@@ -54,35 +203,88 @@ class ReolinkWatcher:
             recordings_base_dir: Basis-Verzeichnis für alle Aufnahmen
             post_detection_duration: Sekunden nach Erkennung aufnehmen
             stream_format: Video-Format (h264 oder h265)
+            aiohttp_session: Gemeinsame HTTP-Session für alle Kameras (optional)
+            snapshot_broker: FFmpeg-Snapshots aus dauerhaft offenem Stream liefern
         """
         self.camera_name = camera_name
-        self.host_obj = Host(host=host, username=username,
-                             password=password, port=port)
+        self._aiohttp_session = aiohttp_session
+        self.host_obj = self._create_host(host, username, password, port)
         self.detection_channel = detection_channel
         self.recording_channels = recording_channels if recording_channels else [
             0]
         self.stream_format = stream_format
 
+        # Snapshot-Methode einmalig anhand des Stream-Formats festlegen
+        if stream_format.lower() == "h265":
+            self._snapshot_impl = self._take_snapshot_ffmpeg
+        else:
+            self._snapshot_impl = self._take_snapshot_api
+
         # Kamera-spezifische Verzeichnisse erstellen
         base_path = Path(recordings_base_dir) / camera_name
         self.snapshot_dir = base_path / "snapshots"
         self.clip_dir = base_path / "clips"
         self.post_detection_duration = post_detection_duration
 
-        # Verzeichnisse erstellen
-        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
-        self.clip_dir.mkdir(parents=True, exist_ok=True)
-
         # Video-Recorder Dictionary für mehrere Channels
         self.video_recorders: Dict[int, VideoRecorder] = {}
 
+        # RTSP-URL für FFmpeg-Snapshots (wird in initialize() gesetzt)
+        self._rtsp_url: Optional[str] = None
+
+        # Optionaler Snapshot Broker (wird in initialize() gestartet)
+        self._use_snapshot_broker = snapshot_broker
+        self._snapshot_broker: Optional[SnapshotBroker] = None
+
+        # Kamera-Fähigkeiten der aktuellen Verbindung (wird in initialize() gesetzt)
+        self._caps: Dict[str, Any] = {}
+
         # Status
         self._person_detected = False
-        self._last_detection_time: Optional[datetime] = None
+        self._recording_state = RecordingState.IDLE
+        self._last_detection_mono: float = 0.0  # Event-Loop-Zeit (monoton)
+        self._snap_seq = 0  # Laufende Nummer für Snapshot-Dateinamen
         self._is_privacy_mode = False
         self._is_connected = False
         self._privacy_check_interval = 30  # Sekunden zwischen Privacy Mode Checks
 
+        # Debouncing für Event-Bursts der Kamera
+        self._debounce_delay = 0.25  # Sekunden bis ein Status übernommen wird
+        self._debounce_max_wait = 1.0  # Spätestens nach so vielen Sekunden übernehmen
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._burst_start: float = 0.0  # Event-Loop-Zeit des ersten Events im Burst
+        self._pending_state: Optional[bool] = None
+        self._debounce_handle: Optional[asyncio.TimerHandle] = None
+
+        # Event-Queue mit einem Worker pro Kamera (wird in initialize() erstellt)
+        self._event_q: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_queued_state: Optional[bool] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+        # Wird in cleanup() gesetzt und beendet das Monitoring
+        self._stop_event = asyncio.Event()
+
+    def _create_host(self, host: str, username: str, password: str, port: int) -> Host:
+        """
+        Erstellt ein Host-Objekt, bei Bedarf mit der gemeinsamen HTTP-Session.
+
+        Returns:
+            Reolink Host Objekt
+        """
+        if self._aiohttp_session is None:
+            return Host(host=host, username=username,
+                        password=password, port=port)
+
+        session = self._aiohttp_session
+        return Host(host=host, username=username, password=password, port=port,
+                    aiohttp_get_session_callback=lambda: session)
+
+    def _create_directories(self) -> None:
+        """Erstellt die Verzeichnisse für Snapshots und Clips."""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.clip_dir.mkdir(parents=True, exist_ok=True)
+
     async def initialize(self) -> bool:
         """
         Initialisiert die Verbindung zur Kamera.
@@ -91,23 +293,36 @@ class ReolinkWatcher:
             True bei Erfolg, False bei Fehler
         """
         try:
+            # Verzeichnisse erstellen (außerhalb des Event-Loops)
+            await asyncio.to_thread(self._create_directories)
+
             _LOGGER.info("[%s] Verbinde mit Kamera %s...",
                          self.camera_name, self.host_obj.host)
 
             # Kamera-Daten abrufen
             await self.host_obj.get_host_data()
 
+            # Fähigkeiten einmal pro Verbindung abfragen und merken
+            self._caps = {
+                "nvr_name": self.host_obj.nvr_name,
+                "model": self.host_obj.model,
+                "sw_version": self.host_obj.sw_version,
+                "channels": self.host_obj.channels,
+                "person": self.host_obj.ai_supported(self.detection_channel, "person"),
+                "onvif": self.host_obj.onvif_enabled,
+            }
+
             _LOGGER.info("[%s] Verbunden mit: %s",
-                         self.camera_name, self.host_obj.nvr_name)
+                         self.camera_name, self._caps["nvr_name"])
             _LOGGER.info("[%s] Modell: %s", self.camera_name,
-                         self.host_obj.model)
+                         self._caps["model"])
             _LOGGER.info("[%s] Firmware: %s", self.camera_name,
-                         self.host_obj.sw_version)
+                         self._caps["sw_version"])
             _LOGGER.info("[%s] Kanäle: %s", self.camera_name,
-                         self.host_obj.channels)
+                         self._caps["channels"])
 
             # Prüfe ob Personenerkennung auf detection_channel unterstützt wird
-            if not self.host_obj.ai_supported(self.detection_channel, "person"):
+            if not self._caps["person"]:
                 _LOGGER.error(
                     "[%s] Personenerkennung wird auf Kanal %s nicht unterstützt!",
                     self.camera_name, self.detection_channel)
@@ -118,7 +333,7 @@ class ReolinkWatcher:
                 self.camera_name, self.detection_channel)
 
             # Prüfe ONVIF Unterstützung
-            if not self.host_obj.onvif_enabled:
+            if not self._caps["onvif"]:
                 _LOGGER.warning(
                     "[%s] ONVIF ist nicht aktiviert, versuche TCP Push Events...", self.camera_name)
 
@@ -129,7 +344,8 @@ class ReolinkWatcher:
                     channel=rec_channel,
                     output_dir=self.clip_dir,
                     post_detection_duration=self.post_detection_duration,
-                    stream_format=self.stream_format
+                    stream_format=self.stream_format,
+                    on_stopped=self._on_recorder_stopped
                 )
                 self.video_recorders[rec_channel] = recorder
                 _LOGGER.info(
@@ -140,6 +356,26 @@ class ReolinkWatcher:
                 "[%s] Aufnahme auf %d Kanal/Kanälen: %s",
                 self.camera_name, len(self.recording_channels), self.recording_channels)
 
+            # RTSP-URL des ersten recording_channels für FFmpeg-Snapshots merken
+            # (wird bei jedem Reconnect mit dem neuen Host-Objekt neu gesetzt)
+            first_recorder = self.video_recorders[self.recording_channels[0]]
+            self._rtsp_url = first_recorder.rtsp_url
+
+            # Snapshot Broker mit aktueller RTSP-URL (neu) starten
+            if self._use_snapshot_broker:
+                if self._snapshot_broker:
+                    await self._snapshot_broker.stop()
+                self._snapshot_broker = SnapshotBroker(
+                    self.camera_name, self._rtsp_url)
+                self._snapshot_broker.start()
+                _LOGGER.info("[%s] Snapshot Broker gestartet", self.camera_name)
+
+            # Event-Worker starten (bleibt bei Reconnects bestehen)
+            if self._worker is None or self._worker.done():
+                self._event_q = asyncio.Queue(maxsize=8)
+                self._last_queued_state = None
+                self._worker = asyncio.create_task(self._event_worker())
+
             self._is_connected = True
             self._is_privacy_mode = False
             return True
@@ -159,45 +395,60 @@ class ReolinkWatcher:
     async def take_snapshot(self) -> Optional[Path]:
         """
         Erstellt einen Snapshot von der Kamera.
-        Versucht zuerst die API-Methode, bei Fehler (z.B. H.265) wird FFmpeg verwendet.
-        Verwendet detection_channel für den Snapshot.
+        Bei H.264 wird die API-Methode verwendet, bei H.265 direkt FFmpeg
+        (die API liefert dort keine Snapshots).
 
         Returns:
             Pfad zum gespeicherten Snapshot oder None bei Fehler
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"person_detection_{timestamp}.jpg"
+        # Laufende Nummer verhindert Überschreiben bei mehreren Snapshots pro Sekunde
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filename = f"person_detection_{timestamp}_{self._snap_seq:04d}.jpg"
+        self._snap_seq += 1
         filepath = self.snapshot_dir / filename
 
         try:
             _LOGGER.info("[%s] Erstelle Snapshot...", self.camera_name)
+            return await self._snapshot_impl(filepath)
+        except Exception as e:
+            _LOGGER.error(
+                "[%s] Fehler beim Erstellen des Snapshots: %s",
+                self.camera_name, e, exc_info=True)
+            return None
 
-            # Versuche zuerst die API-Methode (funktioniert bei H.264)
-            snapshot_data = await self.host_obj.get_snapshot(self.detection_channel)
+    async def _take_snapshot_api(self, filepath: Path) -> Optional[Path]:
+        """
+        Erstellt einen Snapshot über die Kamera-API (H.264).
+        Liefert die API keine Daten, wird auf FFmpeg zurückgegriffen.
+        Verwendet detection_channel für den Snapshot.
 
-            if snapshot_data:
-                # Snapshot speichern
-                with open(filepath, 'wb') as f:
-                    f.write(snapshot_data)
+        Args:
+            filepath: Pfad zum Speichern des Snapshots
 
-                _LOGGER.info("[%s] Snapshot gespeichert: %s (%.2f KB)",
-                             self.camera_name, filepath, len(snapshot_data) / 1024)
-                return filepath
+        Returns:
+            Pfad zum gespeicherten Snapshot oder None bei Fehler
+        """
+        # Nur API-Fehler führen zum FFmpeg-Fallback, alles andere (z.B. Fehler
+        # beim Schreiben) wird an take_snapshot weitergereicht
+        try:
+            snapshot_data = await self.host_obj.get_snapshot(self.detection_channel)
+        except (ReolinkError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("[%s] API-Snapshot Fehler: %s", self.camera_name, e)
+            snapshot_data = None
 
-        except Exception as e:
-            # API-Methode fehlgeschlagen (z.B. bei H.265), versuche FFmpeg
+        if not snapshot_data:
+            # Fallback: Snapshot mit FFmpeg aus RTSP-Stream erstellen
             _LOGGER.info(
                 "[%s] API-Snapshot fehlgeschlagen, verwende FFmpeg-Methode...",
                 self.camera_name)
-
-        # Fallback: Snapshot mit FFmpeg aus RTSP-Stream erstellen
-        try:
             return await self._take_snapshot_ffmpeg(filepath)
-        except Exception as e:
-            _LOGGER.error(
-                "[%s] Fehler beim Erstellen des Snapshots: %s",
-                self.camera_name, e, exc_info=True)
-            return None
+
+        # Snapshot speichern (außerhalb des Event-Loops)
+        await asyncio.to_thread(_write_bytes, filepath, snapshot_data)
+
+        _LOGGER.info("[%s] Snapshot gespeichert: %s (%.2f KB)",
+                     self.camera_name, filepath, len(snapshot_data) / 1024)
+        return filepath
 
     async def _take_snapshot_ffmpeg(self, filepath: Path) -> Optional[Path]:
         """
@@ -211,51 +462,48 @@ class ReolinkWatcher:
         Returns:
             Pfad zum gespeicherten Snapshot oder None bei Fehler
         """
-        if not self.video_recorders:
-            _LOGGER.error(
-                "[%s] Video-Recorder nicht initialisiert", self.camera_name)
-            return None
-
-        # Verwende den ersten recording_channel für den Snapshot
-        first_channel = self.recording_channels[0]
-        recorder = self.video_recorders.get(first_channel)
-
-        if not recorder:
+        if not self._rtsp_url:
             _LOGGER.error(
-                "[%s] Video-Recorder für Kanal %s nicht gefunden",
-                self.camera_name, first_channel)
+                "[%s] RTSP-URL nicht verfügbar, Kamera nicht initialisiert", self.camera_name)
             return None
 
-        # RTSP-URL vom VideoRecorder holen
-        rtsp_url = recorder._get_rtsp_url()
+        # Bild aus dem dauerhaft laufenden Snapshot Broker verwenden
+        if self._snapshot_broker:
+            snapshot_data = self._snapshot_broker.latest_frame()
+            if snapshot_data:
+                await asyncio.to_thread(_write_bytes, filepath, snapshot_data)
+                _LOGGER.info(
+                    "[%s] Broker-Snapshot gespeichert: %s (%.2f KB)",
+                    self.camera_name, filepath, len(snapshot_data) / 1024)
+                return filepath
 
         # FFmpeg-Befehl: Einen Frame extrahieren
+        tmp_path = _part_path(filepath)
         cmd = [
             'ffmpeg',
             '-y',  # Überschreiben ohne Nachfrage
             '-rtsp_transport', 'tcp',  # TCP Transport für bessere Stabilität
-            '-i', rtsp_url,  # Input RTSP-Stream
+            '-i', self._rtsp_url,  # Input RTSP-Stream
             '-frames:v', '1',  # Nur einen Frame extrahieren
             '-q:v', '2',  # Hohe Qualität (1-31, 2 ist sehr gut)
             '-f', 'image2',  # Output-Format
-            str(filepath)
+            str(tmp_path)  # Erst nach Erfolg auf finalen Namen umbenennen
         ]
 
+        process = None
         try:
-            # FFmpeg asynchron ausführen
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            # Warten mit Timeout (max 10 Sekunden)
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=10.0
-            )
+            # FFmpeg asynchron ausführen und warten (max 10 Sekunden)
+            # stdout wird nicht gelesen und daher verworfen
+            async with asyncio.timeout(10.0):
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                _, stderr = await process.communicate()
 
-            if process.returncode == 0 and filepath.exists():
+            if process.returncode == 0 and tmp_path.exists():
+                await asyncio.to_thread(os.replace, tmp_path, filepath)
                 file_size = filepath.stat().st_size
                 _LOGGER.info(
                     "[%s] FFmpeg-Snapshot gespeichert: %s (%.2f KB)",
@@ -265,56 +513,213 @@ class ReolinkWatcher:
             else:
                 _LOGGER.error(
                     "[%s] FFmpeg-Snapshot fehlgeschlagen: %s",
-                    self.camera_name, stderr.decode() if stderr else "Unbekannter Fehler"
+                    self.camera_name,
+                    mask_credentials(stderr.decode(errors='ignore')) if stderr else "Unbekannter Fehler"
                 )
                 return None
 
-        except asyncio.TimeoutError:
+        except TimeoutError:
             _LOGGER.error("[%s] FFmpeg-Snapshot Timeout", self.camera_name)
-            if process:
-                process.kill()
             return None
         except Exception as e:
+            # Ohne Traceback: die Fehlermeldung kann die RTSP-URL enthalten
             _LOGGER.error(
                 "[%s] FFmpeg-Fehler: %s",
-                self.camera_name, e, exc_info=True
+                self.camera_name, mask_credentials(str(e))
             )
             return None
+        finally:
+            # Hängenden Prozess beenden und einsammeln (keine Zombies/offenen Pipes)
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+            # Unvollständige Datei entfernen
+            tmp_path.unlink(missing_ok=True)
 
     def on_person_detection_changed(self) -> None:
         """
         Callback für Personenerkennungs-Events.
         Wird aufgerufen wenn sich der Erkennungsstatus ändert.
         Verwendet detection_channel für die Personenerkennung.
+
+        Events kommen oft in schnellen Bursts oder flackern kurz zwischen
+        erkannt/nicht erkannt. Der Status wird daher erst nach
+        _debounce_delay Sekunden ohne weitere Events übernommen, bei
+        durchgehenden Events aber spätestens nach _debounce_max_wait Sekunden.
         """
         # Status von der Kamera abrufen (vom detection_channel)
-        person_detected = self.host_obj.ai_detected(
+        self._pending_state = self.host_obj.ai_detected(
             self.detection_channel, "person")
 
-        if person_detected != self._person_detected:
-            self._person_detected = person_detected
-            self._last_detection_time = datetime.now()
+        now = self._loop.time()
+        if self._debounce_handle:
+            self._debounce_handle.cancel()
+        else:
+            # Erstes Event eines neuen Bursts
+            self._burst_start = now
 
-            if person_detected:
-                _LOGGER.info("[%s] 🚶 Person erkannt!", self.camera_name)
+        # Burst dauert schon zu lange: sofort übernehmen statt weiter zu warten
+        if now - self._burst_start >= self._debounce_max_wait:
+            self._commit_state()
+            return
+
+        # Laufenden Debounce-Timer neu starten
+        self._debounce_handle = self._loop.call_later(
+            self._debounce_delay, self._commit_state)
+
+    def _commit_state(self) -> None:
+        """
+        Übergibt den zuletzt gemeldeten Erkennungsstatus nach Ablauf des
+        Debounce-Timers an den Event-Worker.
+        """
+        self._debounce_handle = None
+
+        # Unveränderten Status nicht erneut einreihen
+        if self._pending_state == self._last_queued_state:
+            return
+
+        self._last_queued_state = self._pending_state
+        self._enqueue(self._pending_state)
+
+    def _enqueue(self, item: Optional[bool]) -> None:
+        """
+        Reiht ein Event für den Event-Worker ein.
+        Ist die Queue voll, wird das älteste Event verworfen, damit der
+        neueste Status immer verarbeitet wird.
 
-                # Nur Snapshot erstellen wenn noch keine Aufnahme läuft (neue Erkennung)
-                # Prüfe ob mindestens ein Recorder aufnimmt
-                any_recording = any(
-                    recorder.is_recording for recorder in self.video_recorders.values())
-                if not any_recording:
-                    asyncio.create_task(self.take_snapshot())
+        Args:
+            item: Erkennungsstatus oder None nach Ende einer Aufnahme
+        """
+        if self._event_q.full():
+            self._event_q.get_nowait()
+            self._event_q.task_done()
+            _LOGGER.debug("[%s] Event-Queue voll, ältestes Event verworfen",
+                          self.camera_name)
+
+        self._event_q.put_nowait(item)
+
+    async def _event_worker(self) -> None:
+        """
+        Verarbeitet Erkennungs-Events nacheinander.
+        Snapshot und Start/Stop der Aufnahme laufen dadurch immer in der
+        richtigen Reihenfolge ab.
+        """
+        while True:
+            person_detected = await self._event_q.get()
+            try:
+                if person_detected is None:
+                    # Ein Recorder wurde beendet
+                    await self._sync_recording_state()
+                else:
+                    await self._handle_detection(person_detected)
+            except Exception as e:
+                _LOGGER.error("[%s] Fehler bei der Event-Verarbeitung: %s",
+                              self.camera_name, e, exc_info=True)
+            finally:
+                self._event_q.task_done()
+
+    def _on_recorder_stopped(self) -> None:
+        """
+        Callback der Video-Recorder nach Ende einer Aufnahme.
+        Die Zustandsänderung übernimmt der Event-Worker.
+        """
+        if self._event_q is None:
+            return
+
+        self._enqueue(None)
+
+    async def _sync_recording_state(self) -> None:
+        """
+        Beendet den Nachlauf (TAIL -> IDLE), sobald kein Recorder mehr aufnimmt.
+        Danach übernimmt wieder der Snapshot Broker den Stream.
+        """
+        if self._recording_state is not RecordingState.TAIL:
+            return
+        if any(recorder.is_recording for recorder in self.video_recorders.values()):
+            return
+
+        self._recording_state = RecordingState.IDLE
+
+        if self._snapshot_broker:
+            self._snapshot_broker.start()
+
+    async def _handle_detection(self, person_detected: bool) -> None:
+        """
+        Startet bei einer Statusänderung Snapshot bzw. Aufnahme.
+        Zustandsmaschine: IDLE -> RECORDING -> TAIL -> IDLE bzw. TAIL -> RECORDING
+        bei erneuter Erkennung im Nachlauf (ohne neue Aufnahme).
+
+        Args:
+            person_detected: Aktueller Erkennungsstatus
+        """
+        if person_detected == self._person_detected:
+            return
+
+        now = asyncio.get_running_loop().time()
+        if self._last_detection_mono:
+            _LOGGER.debug("[%s] Letzte Statusänderung vor %.0f Sekunden",
+                          self.camera_name, now - self._last_detection_mono)
+
+        self._person_detected = person_detected
+        self._last_detection_mono = now
+
+        # Nachlauf ist vorbei, sobald kein Recorder mehr aufnimmt
+        await self._sync_recording_state()
+
+        if person_detected:
+            _LOGGER.info("[%s] 🚶 Person erkannt!", self.camera_name)
+
+            if self._recording_state is RecordingState.IDLE:
+                # Neue Erkennung: Snapshot zuerst anstoßen, die Aufnahme auf allen
+                # recording_channels wartet aber nicht auf dessen Ende
+                self._snapshot_task = asyncio.create_task(
+                    self._snapshot_and_pause_broker())
 
-                # Video-Aufnahme auf allen recording_channels starten
                 for channel, recorder in self.video_recorders.items():
-                    asyncio.create_task(recorder.start_recording())
-            else:
-                _LOGGER.info("[%s] Person nicht mehr sichtbar",
-                             self.camera_name)
+                    await recorder.start_recording()
+            elif self._recording_state is RecordingState.TAIL:
+                # Erneute Erkennung im Nachlauf: laufende Aufnahme fortsetzen
+                for channel, recorder in self.video_recorders.items():
+                    if recorder.is_recording:
+                        recorder.cancel_delayed_stop()
+                    else:
+                        await recorder.start_recording()
 
+            if any(recorder.is_recording for recorder in self.video_recorders.values()):
+                self._recording_state = RecordingState.RECORDING
+            else:
+                # Keine Aufnahme läuft (z.B. FFmpeg fehlt): zurück nach IDLE,
+                # sonst bliebe der Broker bis zur nächsten Erkennung pausiert
+                _LOGGER.warning("[%s] Keine Aufnahme gestartet", self.camera_name)
+                self._recording_state = RecordingState.IDLE
+                if self._snapshot_broker:
+                    self._snapshot_broker.start()
+        else:
+            _LOGGER.info("[%s] Person nicht mehr sichtbar",
+                         self.camera_name)
+
+            if self._recording_state is RecordingState.RECORDING:
                 # Video-Aufnahme mit Post-Detection-Timer auf allen Channels beenden
                 for channel, recorder in self.video_recorders.items():
-                    asyncio.create_task(recorder.stop_recording_delayed())
+                    if recorder.is_recording:
+                        await recorder.stop_recording_delayed()
+                self._recording_state = RecordingState.TAIL
+
+                # Nimmt kein Recorder mehr auf, direkt zurück nach IDLE
+                await self._sync_recording_state()
+
+    async def _snapshot_and_pause_broker(self) -> None:
+        """
+        Erstellt den Snapshot zu einer neuen Erkennung und pausiert danach
+        den Snapshot Broker für die Dauer der Aufnahme.
+        """
+        await self.take_snapshot()
+
+        # Während der Aufnahme liest der Recorder denselben Stream, der Broker
+        # pausiert bis zum Ende der Aufnahme (ist sie schon vorbei, läuft er weiter)
+        if self._snapshot_broker and self._recording_state is not RecordingState.IDLE:
+            await self._snapshot_broker.stop()
 
     async def start_monitoring(self) -> None:
         """
@@ -330,6 +735,9 @@ class ReolinkWatcher:
                 await self._privacy_mode_recovery_loop()
                 return
 
+            # Event-Loop für den Debounce-Timer merken
+            self._loop = asyncio.get_running_loop()
+
             # Callback registrieren
             self.host_obj.baichuan.register_callback(
                 f"person_watcher_{self.camera_name}", self.on_person_detection_changed)
@@ -340,10 +748,9 @@ class ReolinkWatcher:
             _LOGGER.info(
                 "[%s] ✓ Event-Monitoring aktiv - warte auf Personenerkennung...", self.camera_name)
 
-            # Endlos-Schleife - Events werden über Callback empfangen
-            while True:
-                await asyncio.sleep(self._privacy_check_interval)
-
+            # Events werden über Callback empfangen - hier nur bis zum Stop warten
+            # und zwischendurch die Verbindung prüfen
+            while not await self._wait_for_stop(self._privacy_check_interval):
                 # Periodischer Privacy Mode Check
                 if not await self._check_connection_status():
                     # Verbindung verloren oder Privacy Mode aktiviert
@@ -352,13 +759,6 @@ class ReolinkWatcher:
                     await self._privacy_mode_recovery_loop()
                     break
 
-                # Periodischer Status-Check
-                if self._last_detection_time:
-                    elapsed = (datetime.now() -
-                               self._last_detection_time).total_seconds()
-                    _LOGGER.debug(
-                        "[%s] Letzte Erkennung vor %.0f Sekunden", self.camera_name, elapsed)
-
         except asyncio.CancelledError:
             _LOGGER.info("[%s] Monitoring wird beendet...", self.camera_name)
             raise
@@ -367,6 +767,19 @@ class ReolinkWatcher:
                           self.camera_name, e, exc_info=True)
             raise
 
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """
+        Wartet auf das Stop-Signal, höchstens timeout Sekunden.
+
+        Returns:
+            True wenn das Monitoring beendet werden soll
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._stop_event.is_set()
+
     async def _check_connection_status(self) -> bool:
         """
         Prüft ob die Verbindung zur Kamera noch besteht.
@@ -397,11 +810,16 @@ class ReolinkWatcher:
         _LOGGER.info("[%s] 🔒 Privacy Mode Recovery aktiv - warte auf Deaktivierung...",
                      self.camera_name)
 
+        # Ohne Verbindung keine RTSP-Versuche des Brokers, initialize() startet ihn neu
+        if self._snapshot_broker:
+            await self._snapshot_broker.stop()
+
         retry_count = 0
 
         while True:
             try:
-                await asyncio.sleep(self._privacy_check_interval)
+                if await self._wait_for_stop(self._privacy_check_interval):
+                    return
                 retry_count += 1
 
                 _LOGGER.debug("[%s] Privacy Mode Check #%d...",
@@ -409,9 +827,10 @@ class ReolinkWatcher:
 
                 # Versuche neu zu verbinden
                 # Erstelle neues Host-Objekt für sauberen Reconnect
-                test_host = Host(
+                test_host = self._create_host(
                     host=self.host_obj.host,
                     username=self.host_obj.username,
+                    # Host bietet das Passwort nur als privates Attribut an
                     password=self.host_obj._password,
                     port=self.host_obj.port
                 )
@@ -424,10 +843,8 @@ class ReolinkWatcher:
                                  self.camera_name)
 
                     # Cleanup des alten Host-Objekts
-                    try:
-                        await self.host_obj.logout()
-                    except:
-                        pass
+                    await self._safe(self.host_obj.logout(), 5.0,
+                                     "Logout des alten Host-Objekts")
 
                     # Verwende das neue Host-Objekt
                     self.host_obj = test_host
@@ -468,6 +885,32 @@ class ReolinkWatcher:
                 # Warte trotzdem weiter
                 await asyncio.sleep(self._privacy_check_interval)
 
+    async def _safe(self, awaitable, timeout: float, action: str) -> None:
+        """
+        Führt einen Cleanup-Schritt mit Timeout aus und loggt Fehler nur.
+
+        Args:
+            awaitable: Auszuführender Cleanup-Schritt
+            timeout: Maximale Dauer in Sekunden
+            action: Beschreibung für das Logging
+        """
+        try:
+            await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("[%s] Timeout nach %.0f Sekunden: %s",
+                            self.camera_name, timeout, action)
+        except Exception as e:
+            _LOGGER.debug("[%s] %s fehlgeschlagen: %s",
+                          self.camera_name, action, e)
+
+    async def _disconnect(self) -> None:
+        """
+        Deabonniert die Events und meldet sich von der Kamera ab.
+        """
+        await self._safe(self.host_obj.baichuan.unsubscribe_events(), 3.0,
+                         "Events deabonnieren")
+        await self._safe(self.host_obj.logout(), 5.0, "Logout")
+
     async def cleanup(self) -> None:
         """
         Räumt Ressourcen auf und trennt die Verbindung.
@@ -475,18 +918,48 @@ class ReolinkWatcher:
         try:
             _LOGGER.info("[%s] Trenne Verbindung...", self.camera_name)
 
-            # Alle Video-Recorder stoppen
-            for channel, recorder in self.video_recorders.items():
-                await recorder.stop_recording()
+            # Monitoring und Recovery beenden
+            self._stop_event.set()
 
-            # Events deabonnieren
-            try:
-                await self.host_obj.baichuan.unsubscribe_events()
-            except:
-                pass
+            # Ausstehenden Debounce-Timer verwerfen
+            if self._debounce_handle:
+                self._debounce_handle.cancel()
+                self._debounce_handle = None
+
+            # Event-Worker beenden und Queue leeren
+            if self._worker and not self._worker.done():
+                self._worker.cancel()
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+            self._worker = None
+            if self._snapshot_task and not self._snapshot_task.done():
+                self._snapshot_task.cancel()
+                try:
+                    await self._snapshot_task
+                except asyncio.CancelledError:
+                    pass
+            self._snapshot_task = None
+            if self._event_q:
+                while not self._event_q.empty():
+                    self._event_q.get_nowait()
+                    self._event_q.task_done()
+
+            # Aufnahmen stoppen und Verbindung trennen - parallel und mit Timeouts,
+            # damit eine hängende Kamera nicht den gesamten Shutdown blockiert
+            await asyncio.gather(
+                *(self._safe(recorder.stop_recording(), 15.0,
+                             f"Aufnahme stoppen (Kanal {channel})")
+                  for channel, recorder in self.video_recorders.items()),
+                self._disconnect()
+            )
 
-            # Logout
-            await self.host_obj.logout()
+            # Snapshot Broker beenden
+            if self._snapshot_broker:
+                await self._safe(self._snapshot_broker.stop(), 5.0,
+                                 "Snapshot Broker stoppen")
+                self._snapshot_broker = None
 
             _LOGGER.info("[%s] Verbindung getrennt", self.camera_name)
 
@@ -508,13 +981,37 @@ class MultiCameraManager:
         self.config_file = config_file
         self.watchers: List[ReolinkWatcher] = []
         self.monitoring_tasks: List[asyncio.Task] = []
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
 
-    def load_config(self) -> Dict[str, Any]:
+        # Watcher-Argumente aller aktivierten Kameras (wird in load_config() gesetzt)
+        self._watcher_kwargs: List[Dict[str, Any]] = []
+
+    def _get_aiohttp_session(self) -> aiohttp.ClientSession:
         """
-        Lädt die Konfiguration aus der JSON-Datei.
+        Liefert die gemeinsame HTTP-Session für alle Kameras.
+        Muss innerhalb des laufenden Event-Loops aufgerufen werden.
 
         Returns:
-            Konfigurationsdaten als Dictionary
+            aiohttp ClientSession mit gemeinsamem Connector
+        """
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=4,
+                keepalive_timeout=75,
+                ssl=SSL_CONTEXT
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+
+        return self._aiohttp_session
+
+    def load_config(self) -> Config:
+        """
+        Lädt und validiert die Konfiguration aus der JSON-Datei.
+        Ungültige Kamera-Einträge werden mit einer Warnung übersprungen.
+
+        Returns:
+            Typisierte Konfiguration
         """
         config_path = Path(self.config_file)
 
@@ -527,11 +1024,28 @@ class MultiCameraManager:
                 f"Konfigurationsdatei {self.config_file} nicht gefunden")
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            data = json.loads(config_path.read_bytes())
+
+            cameras: List[CameraConfig] = []
+            for index, camera_data in enumerate(data.get('cameras', [])):
+                try:
+                    cameras.append(CameraConfig.from_dict(camera_data))
+                except (ValueError, TypeError) as e:
+                    _LOGGER.warning("Kamera #%d (%s) übersprungen: %s",
+                                    index + 1, camera_data.get('name', 'unbekannt'), e)
+
+            config = Config(
+                cameras=cameras,
+                settings=Settings.from_dict(data.get('settings', {}))
+            )
+
+            # Watcher-Argumente einmalig für alle aktivierten Kameras vorberechnen
+            self._watcher_kwargs = [
+                _build_watcher_kwargs(camera, config.settings)
+                for camera in config.cameras if camera.enabled]
 
-            _LOGGER.info("Konfiguration geladen: %d Kamera(s) definiert", len(
-                config.get('cameras', [])))
+            _LOGGER.info("Konfiguration geladen: %d Kamera(s) definiert",
+                         len(config.cameras))
             return config
 
         except json.JSONDecodeError as e:
@@ -551,84 +1065,56 @@ class MultiCameraManager:
         try:
             config = self.load_config()
 
-            cameras = config.get('cameras', [])
-            settings = config.get('settings', {})
-
-            post_detection_duration = settings.get(
-                'post_detection_duration', 15)
-            recordings_base_dir = settings.get(
-                'recordings_base_dir', './recordings')
-
-            if not cameras:
+            if not config.cameras:
                 _LOGGER.error("Keine Kameras in der Konfiguration definiert!")
                 return False
 
-            # Filter nur aktivierte Kameras
-            enabled_cameras = [
-                cam for cam in cameras if cam.get('enabled', True)]
-
-            if not enabled_cameras:
+            if not self._watcher_kwargs:
                 _LOGGER.warning("Alle Kameras sind deaktiviert!")
                 return False
 
-            _LOGGER.info("Initialisiere %d Kamera(s)...", len(enabled_cameras))
+            _LOGGER.info("Initialisiere %d Kamera(s)...",
+                         len(self._watcher_kwargs))
+
+            # Erstelle Watcher für jede Kamera (mit gemeinsamer HTTP-Session)
+            aiohttp_session = self._get_aiohttp_session()
+            watchers: List[ReolinkWatcher] = []
+            for kwargs in self._watcher_kwargs:
+                try:
+                    watchers.append(ReolinkWatcher(
+                        **kwargs, aiohttp_session=aiohttp_session))
+                except Exception as e:
+                    _LOGGER.error("Fehler beim Erstellen der Kamera '%s': %s",
+                                  kwargs['camera_name'], e, exc_info=True)
+
+            # Initialisiere alle Verbindungen parallel
+            results = await asyncio.gather(
+                *(watcher.initialize() for watcher in watchers),
+                return_exceptions=True)
 
-            # Initialisiere jede Kamera
             success_count = 0
             privacy_mode_count = 0
-            for camera_config in enabled_cameras:
-                try:
-                    name = camera_config.get('name')
-                    if not name:
-                        _LOGGER.warning("Kamera ohne Namen übersprungen")
-                        continue
-
-                    # Erstelle Watcher für diese Kamera
-                    # Unterstütze sowohl neue als auch alte Konfiguration
-                    detection_channel = camera_config.get('detection_channel')
-                    recording_channels = camera_config.get(
-                        'recording_channels')
-
-                    # Fallback: wenn alte 'channel' Konfiguration verwendet wird
-                    if detection_channel is None:
-                        detection_channel = camera_config.get('channel', 0)
-                    if recording_channels is None:
-                        recording_channels = [camera_config.get('channel', 0)]
-
-                    watcher = ReolinkWatcher(
-                        camera_name=name,
-                        host=camera_config.get('host'),
-                        username=camera_config.get('username'),
-                        password=camera_config.get('password'),
-                        port=camera_config.get('port', 80),
-                        detection_channel=detection_channel,
-                        recording_channels=recording_channels,
-                        recordings_base_dir=recordings_base_dir,
-                        post_detection_duration=post_detection_duration,
-                        stream_format=camera_config.get(
-                            'stream_format', 'h264')
-                    )
-
-                    # Initialisiere Verbindung
-                    init_result = await watcher.initialize()
-
-                    # Füge Watcher immer hinzu, auch wenn Privacy Mode aktiv ist
-                    self.watchers.append(watcher)
-
-                    if init_result:
-                        success_count += 1
-                        _LOGGER.info("[%s] ✓ Erfolgreich initialisiert", name)
-                    elif watcher._is_privacy_mode:
-                        privacy_mode_count += 1
-                        _LOGGER.info(
-                            "[%s] 🔒 Privacy Mode aktiv - wird im Recovery Mode gestartet", name)
-                    else:
-                        _LOGGER.error(
-                            "[%s] Initialisierung fehlgeschlagen", name)
+            for watcher, init_result in zip(watchers, results):
+                name = watcher.camera_name
 
-                except Exception as e:
+                if isinstance(init_result, BaseException):
                     _LOGGER.error("Fehler beim Initialisieren der Kamera '%s': %s",
-                                  camera_config.get('name', 'unbekannt'), e, exc_info=True)
+                                  name, init_result, exc_info=init_result)
+                    continue
+
+                # Füge Watcher immer hinzu, auch wenn Privacy Mode aktiv ist
+                self.watchers.append(watcher)
+
+                if init_result is True:
+                    success_count += 1
+                    _LOGGER.info("[%s] ✓ Erfolgreich initialisiert", name)
+                elif watcher._is_privacy_mode:
+                    privacy_mode_count += 1
+                    _LOGGER.info(
+                        "[%s] 🔒 Privacy Mode aktiv - wird im Recovery Mode gestartet", name)
+                else:
+                    _LOGGER.error(
+                        "[%s] Initialisierung fehlgeschlagen", name)
 
             total_usable = success_count + privacy_mode_count
 
@@ -638,7 +1124,7 @@ class MultiCameraManager:
                 return False
 
             _LOGGER.info("✓ %d von %d Kamera(s) verbunden, %d im Privacy Mode Recovery",
-                         success_count, len(enabled_cameras), privacy_mode_count)
+                         success_count, len(self._watcher_kwargs), privacy_mode_count)
             return True
 
         except Exception as e:
@@ -694,6 +1180,10 @@ class MultiCameraManager:
         if cleanup_tasks:
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
 
+        # Gemeinsame HTTP-Session erst nach allen Logouts schließen
+        if self._aiohttp_session and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+
         _LOGGER.info("✓ Alle Verbindungen getrennt")
 
 
@@ -724,4 +1214,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop verwenden falls installiert (schnellere Socket- und Subprozess-I/O)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -0,0 +1,219 @@
+"""
+Snapshot Broker für Reolink-Kameras
+Hält einen FFmpeg-Prozess mit offener RTSP-Verbindung und puffert das zuletzt dekodierte Bild.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Optional, Tuple
+from video_recorder import mask_credentials
+
+_LOGGER = logging.getLogger(__name__)
+
+# JPEG Start- und End-Marker im MJPEG-Datenstrom
+_JPEG_SOI = b'\xff\xd8'
+_JPEG_EOI = b'\xff\xd9'
+
+
+class SnapshotBroker:
+    """Liefert Snapshots aus einem dauerhaft laufenden FFmpeg-Prozess."""
+
+    def __init__(
+        self,
+        name: str,
+        rtsp_url: str,
+        restart_delay: float = 5.0,
+        max_restart_delay: float = 300.0
+    ):
+        """
+        Initialisiert den Snapshot Broker.
+
+        Args:
+            name: Name der Kamera (für Logging)
+            rtsp_url: RTSP-URL des Streams
+            restart_delay: Sekunden bis FFmpeg nach einem Abbruch neu gestartet wird
+            max_restart_delay: Obergrenze der Wartezeit bei wiederholten Abbrüchen
+        """
+        self.name = name
+        self.rtsp_url = rtsp_url
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+
+        # Nur das letzte Bild wird gehalten: (Event-Loop-Zeit, JPEG-Daten)
+        self._frames: Deque[Tuple[float, bytes]] = deque(maxlen=1)
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _build_command(self) -> list:
+        """
+        Erstellt den FFmpeg-Befehl.
+        Es werden nur Keyframes dekodiert (-skip_frame nokey), das hält die
+        CPU-Last trotz dauerhaft offener Verbindung gering.
+
+        Returns:
+            FFmpeg-Befehl als Liste
+        """
+        return [
+            'ffmpeg',
+            '-nostdin',
+            '-loglevel', 'error',
+            '-rtsp_transport', 'tcp',
+            '-skip_frame', 'nokey',
+            '-i', self.rtsp_url,
+            '-an',
+            '-vsync', 'passthrough',  # Keine doppelten Bilder (auch mit FFmpeg < 5.1)
+            '-q:v', '2',
+            '-f', 'image2pipe',
+            '-vcodec', 'mjpeg',
+            'pipe:1'
+        ]
+
+    def start(self) -> None:
+        """Startet den Broker im Hintergrund."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Beendet den Broker und den FFmpeg-Prozess."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._frames.clear()
+
+    def latest_frame(self, max_age: float = 4.0) -> Optional[bytes]:
+        """
+        Liefert das zuletzt dekodierte Bild ohne zu warten.
+        Da nur Keyframes dekodiert werden, ist ein Bild bis zu einem GOP alt.
+
+        Args:
+            max_age: Maximales Alter des Bildes in Sekunden
+
+        Returns:
+            JPEG-Daten oder None wenn FFmpeg nicht läuft oder kein aktuelles Bild vorliegt
+        """
+        if self._process is None or self._process.returncode is not None:
+            return None
+        if not self._frames:
+            return None
+
+        captured_at, frame = self._frames[0]
+        if asyncio.get_running_loop().time() - captured_at > max_age:
+            _LOGGER.debug("[%s] Letztes Broker-Bild ist älter als %.1f Sekunden",
+                          self.name, max_age)
+            return None
+        return frame
+
+    async def _run(self) -> None:
+        """
+        Startet FFmpeg und startet es nach einem Abbruch neu.
+        Bei wiederholten Abbrüchen (z.B. Kamera offline) verdoppelt sich die
+        Wartezeit bis max_restart_delay, nur der erste Abbruch wird als Warnung geloggt.
+        """
+        delay = self.restart_delay
+        failures = 0
+
+        try:
+            while True:
+                stderr_lines: Deque[str] = deque(maxlen=15)
+                got_frames = False
+
+                try:
+                    self._process = await asyncio.create_subprocess_exec(
+                        *self._build_command(),
+                        stdin=asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    _LOGGER.debug("[%s] Snapshot Broker gestartet", self.name)
+
+                    # stderr laufend lesen, damit die Pipe nicht vollläuft
+                    stderr_task = asyncio.create_task(
+                        self._read_stderr(self._process.stderr, stderr_lines))
+                    try:
+                        got_frames = await self._read_frames(self._process.stdout)
+                        await self._process.wait()
+                        await stderr_task
+                    finally:
+                        stderr_task.cancel()
+
+                    # Nach einem Lauf mit Bildern wieder mit kurzer Wartezeit beginnen
+                    if got_frames:
+                        delay = self.restart_delay
+                        failures = 0
+                    failures += 1
+
+                    # Wiederholte Abbrüche nur im Debug-Log
+                    log = _LOGGER.warning if failures == 1 else _LOGGER.debug
+                    details = mask_credentials('\n'.join(stderr_lines)) or "keine Fehlerausgabe"
+                    log("[%s] Snapshot Broker beendet (Exit-Code: %s), Neustart in %.0f Sekunden:\n%s",
+                        self.name, self._process.returncode, delay, details)
+
+                except FileNotFoundError:
+                    _LOGGER.error(
+                        "FFmpeg nicht gefunden! Bitte installieren: sudo apt install ffmpeg")
+                    return
+                except Exception as e:
+                    _LOGGER.error("[%s] Fehler im Snapshot Broker: %s",
+                                  self.name, e, exc_info=True)
+
+                self._frames.clear()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_restart_delay)
+
+        finally:
+            if self._process and self._process.returncode is None:
+                self._process.kill()
+                await self._process.wait()
+            self._process = None
+
+    async def _read_stderr(self, stderr: asyncio.StreamReader, lines: Deque[str]) -> None:
+        """
+        Liest die Fehlerausgabe von FFmpeg und merkt sich die letzten Zeilen.
+
+        Args:
+            stderr: stderr des FFmpeg-Prozesses
+            lines: Puffer für die letzten Zeilen
+        """
+        while True:
+            line = await stderr.readline()
+            if not line:
+                return
+            lines.append(line.decode('utf-8', errors='ignore').rstrip())
+
+    async def _read_frames(self, stdout: asyncio.StreamReader) -> bool:
+        """
+        Liest den MJPEG-Datenstrom und merkt sich jeweils das letzte Bild.
+
+        Args:
+            stdout: stdout des FFmpeg-Prozesses
+
+        Returns:
+            True wenn mindestens ein Bild gelesen wurde
+        """
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        got_frames = False
+
+        while True:
+            chunk = await stdout.read(65536)
+            if not chunk:
+                return got_frames
+            buffer += chunk
+
+            # Alle vollständigen Bilder aus dem Puffer entnehmen
+            while True:
+                end = buffer.find(_JPEG_EOI)
+                if end < 0:
+                    break
+
+                frame = bytes(buffer[:end + 2])
+                del buffer[:end + 2]
+
+                if frame.startswith(_JPEG_SOI):
+                    got_frames = True
+                    self._frames.append((loop.time(), frame))